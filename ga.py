@@ -0,0 +1,843 @@
+"""Steady-state genetic algorithm with a NumPy-backed population.
+
+The population is stored structure-of-arrays style: a single float64
+ndarray of shape ``(pop_size, n_genes)`` owned by the GA plus a parallel
+fitness vector.  Genome classes describe the search space and provide
+spawn operators that work on ndarray rows, so the hot loop moves
+contiguous memory instead of per-individual Python objects.
+"""
+
+import array
+import bisect
+import collections
+import copy
+import itertools
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # numba is optional; pure-Python fallbacks are used
+    numba = None
+
+if numba is not None:
+    @numba.njit(cache=True)
+    def _choose_nb(fitness, pop_size, local_size, tourney_size, mask):
+        """Tournament in a circular neighbourhood, compiled.
+
+        Returns ``(winner, runner, loser)`` indices in one pass instead
+        of building and sorting a Python list of (fitness, index) pairs.
+        ``mask`` is ``pop_size - 1`` for power-of-two populations (wrap
+        with a single AND) and -1 otherwise (wrap with modulo).
+        """
+        base = np.random.randint(pop_size)
+        winner = runner = loser = -1
+        winner_f = runner_f = np.inf
+        loser_f = -np.inf
+        for _ in range(tourney_size):
+            i = base + np.random.randint(local_size)
+            if mask >= 0:
+                i &= mask
+            else:
+                i %= pop_size
+            f = fitness[i]
+            if f < winner_f:
+                runner, runner_f = winner, winner_f
+                winner, winner_f = i, f
+            elif f < runner_f:
+                runner, runner_f = i, f
+            if f >= loser_f:
+                loser, loser_f = i, f
+        if runner == -1:
+            runner = winner
+        return winner, runner, loser
+
+    @numba.njit(cache=True)
+    def _seed_nb(seed):
+        # numba keeps its own RNG state per process; forked workers
+        # inherit the parent's and must be reseeded explicitly
+        np.random.seed(seed)
+
+    @numba.njit(cache=True)
+    def _crossover_nb(a, b, out):
+        """Two-point crossover of rows ``a`` and ``b`` into ``out``."""
+        n = a.shape[0]
+        pt1 = np.random.randint(n)
+        pt2 = np.random.randint(pt1, n) + 1
+        for i in range(n):
+            out[i] = a[i]
+        for i in range(pt1, pt2):
+            out[i] = b[i]
+
+    @numba.njit(cache=True)
+    def _fused_spawn_nb(parent, partner, out, p_partner, p_small, p_big,
+                        delta_scale, low, high):
+        """Crossover and mutation fused into one pass: every gene is
+        independently kept, taken from the partner, nudged, or redrawn.
+        Same information flow as copy-then-mutate, half the memory
+        traffic."""
+        for i in range(parent.shape[0]):
+            r = np.random.random()
+            if r < p_partner:
+                out[i] = partner[i]
+            elif r < p_partner + p_small:
+                out[i] = parent[i] + (np.random.random() - 0.5) * delta_scale
+            elif r < p_partner + p_small + p_big:
+                out[i] = low + np.random.random() * (high - low)
+            else:
+                out[i] = parent[i]
+
+    @numba.njit(cache=True)
+    def _point_mutate_nb(parent, out, delta_scale, low, high, reset):
+        """Copy ``parent`` into ``out`` and disturb one gene: add a
+        uniform delta of ``delta_scale``, or redraw it from
+        ``[low, high)`` when ``reset`` is set."""
+        n = parent.shape[0]
+        for i in range(n):
+            out[i] = parent[i]
+        i = np.random.randint(n)
+        if reset:
+            out[i] = low + np.random.random() * (high - low)
+        else:
+            out[i] += (np.random.random() - 0.5) * delta_scale
+else:
+    _choose_nb = None
+    _seed_nb = None
+    _crossover_nb = None
+    _fused_spawn_nb = None
+    _point_mutate_nb = None
+
+
+class _RandBlock:
+    """Block-buffered random numbers from one PCG64 generator.
+
+    Every draw from :mod:`random` costs an attribute lookup plus a
+    method dispatch; generating blocks with ``np.random.Generator`` and
+    handing out elements from a Python list pays that cost once per
+    ``BLOCK`` draws instead of once per draw.
+    """
+
+    BLOCK = 1 << 14
+
+    def __init__(self, seed=None):
+        self._rng = np.random.default_rng(seed)
+        self._ints = self._rng.integers(0, 1 << 30, self.BLOCK).tolist()
+        self._floats = self._rng.random(self.BLOCK).tolist()
+        self._int_i = 0
+        self._float_i = 0
+
+    def randint(self, hi):
+        """Uniform int in ``[0, hi)``; ``hi`` must stay far below 2**30
+        for the modulo bias to be negligible."""
+        i = self._int_i
+        if i == self.BLOCK:
+            self._ints = self._rng.integers(0, 1 << 30, self.BLOCK).tolist()
+            i = 0
+        self._int_i = i + 1
+        return self._ints[i] % hi
+
+    def random(self):
+        i = self._float_i
+        if i == self.BLOCK:
+            self._floats = self._rng.random(self.BLOCK).tolist()
+            i = 0
+        self._float_i = i + 1
+        return self._floats[i]
+
+
+#: shared generator for the genome operators and tournament picks
+_rand = _RandBlock()
+
+#: set by the SIGINT handler; evolve loops poll it and stop gracefully
+_stop_event = threading.Event()
+_sigint_installed = False
+
+
+def _handle_sigint(signum, frame):
+    _stop_event.set()
+
+
+def _ensure_sigint_handler():
+    """Install the SIGINT-to-Event bridge once per process.
+
+    Installing and restoring a handler on every evolve() call cost two
+    syscalls per run and broke nested use.  Outside the main thread
+    (where signal.signal raises) installation is skipped and Ctrl-C
+    keeps its default behaviour.
+    """
+    global _sigint_installed
+    if _sigint_installed:
+        return
+    try:
+        signal.signal(signal.SIGINT, _handle_sigint)
+    except ValueError:
+        return
+    _sigint_installed = True
+
+
+def _island_worker(args):
+    """Evolve one island for a fixed number of generations.
+
+    Runs in a worker process; every random stream is reseeded first,
+    because forked children inherit the parent's PRNG state and would
+    otherwise evolve in lockstep.
+    """
+    global _rand
+    island, gens, target_fitness = args
+    _rand = _RandBlock()
+    seed = int.from_bytes(os.urandom(4), "little")
+    np.random.seed(seed)
+    if _seed_nb is not None:
+        _seed_nb(seed)
+    island.evolve(target_fitness=target_fitness,
+                  max_gens=island.generation + gens)
+    return island
+
+
+class BaseGenome:
+    """Shared spawn machinery.
+
+    ``spawn_chances`` is a class attribute listing ``(operator, weight)``
+    pairs; weights are any positive numbers and need not sum to one.
+    The cumulative table, operator list and ``total_target`` are derived
+    from it once per subclass.  Individuals therefore carry nothing but
+    their genes, which keeps large populations compact.
+    """
+
+    __slots__ = ()
+
+    spawn_chances = ()
+
+    def __init_subclass__(cls):
+        if "spawn_chances" in cls.__dict__:
+            cls._cum = list(itertools.accumulate(
+                chance for _, chance in cls.spawn_chances))
+            cls._funs = [fun for fun, _ in cls.spawn_chances]
+            cls.total_target = cls._cum[-1]
+
+    def _choose_spawn(self):
+        rnd = _rand.random() * self.total_target
+        return self._funs[bisect.bisect_left(self._cum, rnd)]
+
+    def spawn(self, partner, recycle=None):
+        """Create a child, optionally reusing ``recycle``'s storage.
+
+        ``recycle`` is a genome about to be evicted anyway; operators
+        that start from a copy of the parent can overwrite its gene
+        buffer in place instead of allocating a fresh one.  The caller
+        must not pass a genome that is still participating (the parents
+        themselves).  Partner and recycle travel as plain call
+        arguments; nothing is stashed on the parent between calls.
+        """
+        return self._choose_spawn()(self, partner, recycle)
+
+
+class PermutateGenome(BaseGenome):
+    """Genome holding a permutation of a fixed multiset of values.
+
+    Unlike ``FloatGenome``, individuals are objects carrying their own
+    genes — an ``int32`` ndarray, so copies are C-level memcpys and the
+    fitness function sees a contiguous unboxed buffer.  The operators
+    must preserve the multiset, which cannot be expressed as independent
+    per-gene arithmetic on array rows.
+    """
+
+    __slots__ = ("genes",)
+
+    def __init__(self, initial):
+        self.genes = np.array(initial, dtype=np.int32)
+
+    def copy(self, partner=None, recycle=None):
+        if recycle is not None:
+            recycle.genes[:] = self.genes
+            return recycle
+        return PermutateGenome(self.genes)
+
+    def randomize(self):
+        child = self.copy()
+        np.random.shuffle(child.genes)
+        return child
+
+    def swap(self, partner=None, recycle=None):
+        child = self.copy(None, recycle)
+        i = _rand.randint(len(child.genes))
+        j = _rand.randint(len(child.genes))
+        child.genes[i], child.genes[j] = child.genes[j], child.genes[i]
+        return child
+
+    def crossover(self, partner, recycle=None):
+        """Position-based crossover, O(n).
+
+        Positions where the parents agree are copied through.  The
+        conflicting positions are refilled left to right, each taking the
+        next still-unused value from a randomly chosen parent, so the
+        child stays a permutation of the shared multiset without any
+        ``list.remove``/``pop`` scans.
+        """
+        g1, g2 = self.genes, partner.genes
+        child = self.copy(None, recycle)
+        genes = child.genes
+        disagree = g1 != g2
+        conflicts = np.flatnonzero(disagree).tolist()
+        # The conflict values of either parent form exactly the multiset
+        # ``remaining``, so two cursors over those streams always find a
+        # value whose count is still positive.
+        stream1 = g1[disagree].tolist()
+        stream2 = g2[disagree].tolist()
+        remaining = {}
+        for value in stream1:
+            remaining[value] = remaining.get(value, 0) + 1
+        p1 = p2 = 0
+        for i in conflicts:
+            if _rand.random() < 0.5:
+                while not remaining.get(stream1[p1]):
+                    p1 += 1
+                value = stream1[p1]
+                p1 += 1
+            else:
+                while not remaining.get(stream2[p2]):
+                    p2 += 1
+                value = stream2[p2]
+                p2 += 1
+            remaining[value] -= 1
+            genes[i] = value
+        return child
+
+    spawn_chances = ((swap, 6), (crossover, 3), (copy, 1))
+
+
+class VectorGenome(BaseGenome):
+    """Object-mode float genome backed by ``array.array('d')``.
+
+    The fallback when individuals cannot live in the shared population
+    array (ragged problems, mixed populations, embedding without the
+    SoA machinery): slices and element access stay C-implemented over
+    unboxed 8-byte doubles, instead of a Python list of boxed floats.
+    Operators mirror ``FloatGenome``'s.
+    """
+
+    __slots__ = ("genes", "low", "high", "resolution")
+
+    def __init__(self, initial, low=0.0, high=1.0, resolution=1e-3):
+        self.genes = array.array("d", initial)
+        self.low = low
+        self.high = high
+        self.resolution = resolution
+
+    def copy(self, partner=None, recycle=None):
+        if recycle is not None:
+            recycle.genes[:] = self.genes
+            return recycle
+        return VectorGenome(self.genes, self.low, self.high,
+                            self.resolution)
+
+    def randomize(self):
+        child = self.copy()
+        genes = child.genes
+        span = self.high - self.low
+        for i in range(len(genes)):
+            genes[i] = self.low + _rand.random() * span
+        return child
+
+    def crossover(self, partner, recycle=None):
+        child = self.copy(None, recycle)
+        n = len(child.genes)
+        pt1 = _rand.randint(n)
+        pt2 = pt1 + 1 + _rand.randint(n - pt1)
+        child.genes[pt1:pt2] = partner.genes[pt1:pt2]
+        return child
+
+    def small_mutate(self, partner=None, recycle=None):
+        child = self.copy(None, recycle)
+        i = _rand.randint(len(child.genes))
+        child.genes[i] += (_rand.random() - 0.5) * 10 * self.resolution
+        return child
+
+    def medium_mutate(self, partner=None, recycle=None):
+        child = self.copy(None, recycle)
+        i = _rand.randint(len(child.genes))
+        child.genes[i] += (_rand.random() - 0.5) * 1000 * self.resolution
+        return child
+
+    def big_mutate(self, partner=None, recycle=None):
+        child = self.copy(None, recycle)
+        i = _rand.randint(len(child.genes))
+        child.genes[i] = self.low + _rand.random() * (self.high - self.low)
+        return child
+
+    spawn_chances = ((crossover, 3), (small_mutate, 3),
+                     (medium_mutate, 2), (big_mutate, 1), (copy, 1))
+
+
+class FloatGenome(BaseGenome):
+    """Real-valued genome of ``n_genes`` floats in ``[low, high]``.
+
+    One instance describes every individual of a run; the operators take
+    a parent row of the population array and return a child row.
+    ``resolution`` sets the scale of the smallest mutation step.
+    """
+
+    __slots__ = ("n_genes", "low", "high", "resolution", "fused")
+
+    #: per-gene probabilities used by the fused spawn path
+    FUSED_PARTNER = 0.3
+    FUSED_SMALL = 0.05
+    FUSED_BIG = 0.01
+
+    def __init__(self, n_genes, low=0.0, high=1.0, resolution=1e-3,
+                 fused=False):
+        self.n_genes = n_genes
+        self.low = low
+        self.high = high
+        self.resolution = resolution
+        self.fused = fused
+
+    def random_row(self, out):
+        out[:] = np.random.uniform(self.low, self.high, self.n_genes)
+
+    def spawn(self, parent, partner, out):
+        """Write a child of ``parent`` into the row ``out``.
+
+        ``out`` may not alias ``parent`` or ``partner``; the GA hands in
+        either the evicted loser's row or a scratch buffer.
+        """
+        if self.fused:
+            self.fused_spawn(parent, partner, out)
+            return
+        self._choose_spawn()(self, parent, partner, out)
+
+    def fused_spawn(self, parent, partner, out):
+        """One pass over the genes doing crossover and mutation at
+        once: each gene independently stays, comes from the partner,
+        gets a small nudge, or is redrawn uniformly.  Exchanges the
+        per-child operator choice for per-gene choices while touching
+        every byte exactly once."""
+        if _fused_spawn_nb is not None:
+            _fused_spawn_nb(parent, partner, out,
+                            self.FUSED_PARTNER, self.FUSED_SMALL,
+                            self.FUSED_BIG, 10 * self.resolution,
+                            self.low, self.high)
+            return
+        r = np.random.random(self.n_genes)
+        np.copyto(out, np.where(r < self.FUSED_PARTNER, partner, parent))
+        small = (r >= self.FUSED_PARTNER) & \
+                (r < self.FUSED_PARTNER + self.FUSED_SMALL)
+        if small.any():
+            out[small] += (np.random.random(int(small.sum())) - 0.5) * \
+                10 * self.resolution
+        big = (r >= self.FUSED_PARTNER + self.FUSED_SMALL) & \
+              (r < self.FUSED_PARTNER + self.FUSED_SMALL + self.FUSED_BIG)
+        if big.any():
+            out[big] = np.random.uniform(self.low, self.high,
+                                         int(big.sum()))
+
+    def copy(self, parent, partner, out):
+        out[:] = parent
+
+    def crossover(self, parent, partner, out):
+        if _crossover_nb is not None:
+            _crossover_nb(parent, partner, out)
+            return
+        out[:] = parent
+        pt1 = _rand.randint(self.n_genes)
+        pt2 = pt1 + 1 + _rand.randint(self.n_genes - pt1)
+        out[pt1:pt2] = partner[pt1:pt2]
+
+    def small_mutate(self, parent, partner, out):
+        if _point_mutate_nb is not None:
+            _point_mutate_nb(parent, out, 10 * self.resolution,
+                             0.0, 0.0, False)
+            return
+        out[:] = parent
+        i = _rand.randint(self.n_genes)
+        out[i] += (_rand.random() - 0.5) * 10 * self.resolution
+
+    def medium_mutate(self, parent, partner, out):
+        if _point_mutate_nb is not None:
+            _point_mutate_nb(parent, out, 1000 * self.resolution,
+                             0.0, 0.0, False)
+            return
+        out[:] = parent
+        i = _rand.randint(self.n_genes)
+        out[i] += (_rand.random() - 0.5) * 1000 * self.resolution
+
+    def big_mutate(self, parent, partner, out):
+        if _point_mutate_nb is not None:
+            _point_mutate_nb(parent, out, 0.0, self.low, self.high, True)
+            return
+        out[:] = parent
+        i = _rand.randint(self.n_genes)
+        out[i] = self.low + _rand.random() * (self.high - self.low)
+
+    spawn_chances = ((crossover, 3), (small_mutate, 3),
+                     (medium_mutate, 2), (big_mutate, 1), (copy, 1))
+
+
+class GA:
+    """Steady-state tournament GA minimising ``fitfun``.
+
+    ``fitfun`` takes one gene row and returns a float; lower is better,
+    and ``evolve`` stops once the best fitness reaches the target.
+    Tournaments are local: participants come from a window of
+    ``local_size`` neighbours on the (circular) population array, which
+    keeps selection pressure soft and the population diverse.
+    """
+
+    #: how many children to buffer between ``fitfun_batch`` calls
+    BATCH_SIZE = 64
+
+    def __init__(self, fitfun, genome, pop_size=10000, local_size=20,
+                 tourney_size=3, verbose=False, fitfun_batch=None,
+                 cache_size=1 << 16, power_of_two=False,
+                 surrogate_fitfun=None):
+        if surrogate_fitfun is not None and fitfun_batch is not None:
+            raise ValueError("surrogate_fitfun does not combine with "
+                             "fitfun_batch")
+        self.fitfun = fitfun
+        self.fitfun_batch = fitfun_batch
+        self.surrogate_fitfun = surrogate_fitfun
+        self._best_surrogate = float("inf")
+        self.genome = genome
+        self.cache_size = cache_size
+        self._cache = collections.OrderedDict() if cache_size else None
+        if power_of_two:
+            # rounding up lets the circular wrap in _choose be a single
+            # AND with pop_size - 1 instead of an integer division
+            pop_size = 1 << (pop_size - 1).bit_length()
+            self._mask = pop_size - 1
+        else:
+            self._mask = -1
+        self.pop_size = pop_size
+        self.local_size = local_size
+        self.tourney_size = tourney_size
+        self.verbose = verbose
+        # FloatGenome describes rows of a shared array; object genomes
+        # (PermutateGenome, ...) are prototypes cloned per individual.
+        self.array_mode = hasattr(genome, "random_row")
+        self.fitness_arr = np.empty(pop_size)
+        if self.array_mode:
+            self.pop_arr = np.empty((pop_size, genome.n_genes),
+                                    dtype=np.float64)
+            # scratch row for when the loser slot aliases a parent
+            self._child_buf = np.empty(genome.n_genes)
+        else:
+            self.pop = [None] * pop_size
+        self.best = None
+        self.best_fitness = float("inf")
+        self.generation = 0
+        self.eden_state()
+
+    def _cache_key(self, row):
+        """Exact bytes key for a gene row; floats are quantized to the
+        genome resolution so equal-up-to-resolution rows share an entry."""
+        resolution = getattr(self.genome, "resolution", None)
+        if resolution:
+            return np.round(row / resolution).astype(np.int64).tobytes()
+        return np.ascontiguousarray(row).tobytes()
+
+    def _cache_lookup(self, key, score_fun, arg):
+        fitness = self._cache.get(key)
+        if fitness is not None:
+            self._cache.move_to_end(key)
+            return fitness
+        fitness = score_fun(arg)
+        self._cache[key] = fitness
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return fitness
+
+    def _score_row(self, row):
+        if self._cache is None:
+            return self._score_row_uncached(row)
+        return self._cache_lookup(self._cache_key(row),
+                                  self._score_row_uncached, row)
+
+    def _score_genome(self, genome):
+        if self._cache is None:
+            return self.fitfun(genome)
+        return self._cache_lookup(self._cache_key(np.asarray(genome.genes)),
+                                  self.fitfun, genome)
+
+    # With a surrogate, the population carries cheap approximate scores
+    # for selection and the expensive fitfun only runs on individuals
+    # whose surrogate score is a new record (see _check_best*).
+
+    def _selection_score_row(self, row):
+        if self.surrogate_fitfun is not None:
+            return self.surrogate_fitfun(row)
+        return self._score_row(row)
+
+    def _selection_score_genome(self, genome):
+        if self.surrogate_fitfun is not None:
+            return self.surrogate_fitfun(genome)
+        return self._score_genome(genome)
+
+    def _score_row_uncached(self, row):
+        if self.fitfun is not None:
+            return self.fitfun(row)
+        return self.fitfun_batch(row[np.newaxis])[0]
+
+    def eden_state(self):
+        """Fill the population with random genomes and score them."""
+        if not self.array_mode:
+            for i in range(self.pop_size):
+                genome = self.genome.randomize()
+                fitness = self._selection_score_genome(genome)
+                self.pop[i] = genome
+                self.fitness_arr[i] = fitness
+                self._check_best_genome(genome, fitness)
+            return
+        for i in range(self.pop_size):
+            self.genome.random_row(self.pop_arr[i])
+        if self.fitfun_batch is not None:
+            self.fitness_arr[:] = self.fitfun_batch(self.pop_arr)
+            self._check_best(int(np.argmin(self.fitness_arr)))
+        else:
+            for i in range(self.pop_size):
+                self.fitness_arr[i] = self._selection_score_row(self.pop_arr[i])
+                self._check_best(i)
+
+    def seed(self, genomes):
+        """Inject known-good genomes (gene rows in array mode) into
+        random population slots."""
+        for genome in genomes:
+            i = _rand.randint(self.pop_size)
+            if self.array_mode:
+                self.pop_arr[i] = genome
+                self.fitness_arr[i] = self._selection_score_row(self.pop_arr[i])
+                self._check_best(i)
+            else:
+                fitness = self._selection_score_genome(genome)
+                self.pop[i] = genome
+                self.fitness_arr[i] = fitness
+                self._check_best_genome(genome, fitness)
+
+    def _choose(self):
+        """Pick tournament participants from a circular neighbourhood."""
+        base = _rand.randint(self.pop_size)
+        idxs = []
+        for _ in range(self.tourney_size):
+            i = base + _rand.randint(self.local_size)
+            if self._mask >= 0:
+                i &= self._mask
+            else:
+                i %= self.pop_size
+            idxs.append(i)
+        return idxs
+
+    # Best tracking is split in two: the _check_best* guards reject the
+    # overwhelmingly common no-improvement case with one compare, and
+    # only _record_best touches the copy/print/flush work.
+
+    def _record_best(self, fitness, best):
+        self.best_fitness = fitness
+        self.best = best
+        if self.verbose:
+            print("gen %d: fitness %g" % (self.generation,
+                                          self.best_fitness))
+            sys.stdout.flush()
+
+    def _check_best(self, i):
+        fitness = self.fitness_arr[i]
+        if self.surrogate_fitfun is not None:
+            if fitness >= self._best_surrogate:
+                return
+            self._best_surrogate = fitness
+            fitness = self._score_row(self.pop_arr[i])
+        if fitness < self.best_fitness:
+            self._record_best(fitness, self.pop_arr[i].copy())
+
+    def _check_best_genome(self, genome, fitness):
+        if self.surrogate_fitfun is not None:
+            if fitness >= self._best_surrogate:
+                return
+            self._best_surrogate = fitness
+            fitness = self._score_genome(genome)
+        if fitness < self.best_fitness:
+            self._record_best(fitness, genome.copy())
+
+    def evolve(self, target_fitness=0.0, max_gens=None):
+        """Run tournaments until ``target_fitness`` is reached,
+        ``max_gens`` generations pass, or SIGINT arrives."""
+        _ensure_sigint_handler()
+        _stop_event.clear()
+        if not self.array_mode:
+            self._evolve_objects(target_fitness, max_gens, _stop_event)
+        elif self.fitfun_batch is not None:
+            self._evolve_batched(target_fitness, max_gens, _stop_event)
+        else:
+            self._evolve_scalar(target_fitness, max_gens, _stop_event)
+        return self.best, self.best_fitness
+
+    @staticmethod
+    def _sort3(a, fa, b, fb, c, fc):
+        """Order three (index, fitness) pairs by fitness with three
+        compares — no tuple list, no sort call."""
+        if fb < fa:
+            a, fa, b, fb = b, fb, a, fa
+        if fc < fb:
+            b, fb, c, fc = c, fc, b, fb
+            if fb < fa:
+                a, fa, b, fb = b, fb, a, fa
+        return a, b, c
+
+    def _tournament(self):
+        """Run one tournament, returning (winner, runner, loser)."""
+        if _choose_nb is not None:
+            return _choose_nb(self.fitness_arr, self.pop_size,
+                              self.local_size, self.tourney_size,
+                              self._mask)
+        if self.tourney_size == 3:
+            a, b, c = self._choose()
+            fitness = self.fitness_arr
+            return self._sort3(a, fitness[a], b, fitness[b], c, fitness[c])
+        idx = np.array(self._choose())
+        fitness = self.fitness_arr[idx]
+        order = np.argpartition(fitness, (0, 1, len(idx) - 1))
+        return (int(idx[order[0]]), int(idx[order[1]]),
+                int(idx[order[-1]]))
+
+    def evolve_islands(self, target_fitness=0.0, n_islands=None,
+                       migrate_every=5000, migrants=3, rounds=10):
+        """Coarse-grained island-model evolution.
+
+        The population is split into ``n_islands`` contiguous slices
+        (default: one per CPU) which evolve independently in worker
+        processes for ``migrate_every`` generations; between rounds each
+        island sends its best ``migrants`` individuals to the next
+        island around a ring.  Afterwards the islands are merged back
+        into this GA's population.
+        """
+        if n_islands is None:
+            n_islands = os.cpu_count() or 1
+        islands = self._split_islands(n_islands)
+        with multiprocessing.Pool(n_islands) as pool:
+            for _ in range(rounds):
+                islands = pool.map(_island_worker,
+                                   [(island, migrate_every, target_fitness)
+                                    for island in islands])
+                for k, island in enumerate(islands):
+                    islands[(k + 1) % n_islands].seed(
+                        island._emigrants(migrants))
+                if min(i.best_fitness for i in islands) <= target_fitness:
+                    break
+        self._merge_islands(islands)
+        return self.best, self.best_fitness
+
+    def _split_islands(self, n_islands):
+        size = self.pop_size // n_islands
+        islands = []
+        for k in range(n_islands):
+            island = copy.copy(self)
+            island.pop_size = size
+            # the parent's wrap mask is sized for the full population;
+            # keep the AND trick only if the island is a power of two
+            island._mask = size - 1 if size & (size - 1) == 0 else -1
+            lo = k * size
+            island.fitness_arr = self.fitness_arr[lo:lo + size].copy()
+            if self.array_mode:
+                island.pop_arr = self.pop_arr[lo:lo + size].copy()
+            else:
+                island.pop = self.pop[lo:lo + size]
+            island._cache = (collections.OrderedDict()
+                             if self.cache_size else None)
+            islands.append(island)
+        return islands
+
+    def _emigrants(self, migrants):
+        order = np.argsort(self.fitness_arr)[:migrants]
+        if self.array_mode:
+            return [self.pop_arr[i].copy() for i in order]
+        # copies, so a migrant can't alias a slot that later gets
+        # recycled as a child buffer in two populations at once
+        return [self.pop[i].copy() for i in order]
+
+    def _merge_islands(self, islands):
+        start = self.generation
+        size = islands[0].pop_size
+        for k, island in enumerate(islands):
+            lo = k * size
+            self.fitness_arr[lo:lo + size] = island.fitness_arr
+            if self.array_mode:
+                self.pop_arr[lo:lo + size] = island.pop_arr
+            else:
+                self.pop[lo:lo + size] = island.pop
+            if island.best_fitness < self.best_fitness:
+                self.best_fitness = island.best_fitness
+                self.best = island.best
+            self.generation += island.generation - start
+
+    def _evolve_objects(self, target_fitness, max_gens, stop):
+        while self.best_fitness > target_fitness and not stop.is_set():
+            if max_gens is not None and self.generation >= max_gens:
+                break
+            winner_i, runner_i, loser_i = self._tournament()
+            winner = self.pop[winner_i]
+            runner = self.pop[runner_i]
+            # the loser is evicted anyway; let the child reuse its gene
+            # buffer unless tournament picks collided
+            if loser_i != winner_i and loser_i != runner_i:
+                recycle = self.pop[loser_i]
+            else:
+                recycle = None
+            child = winner.spawn(runner, recycle)
+            fitness = self._selection_score_genome(child)
+            self.pop[loser_i] = child
+            self.fitness_arr[loser_i] = fitness
+            self._check_best_genome(child, fitness)
+            self.generation += 1
+
+    def _evolve_scalar(self, target_fitness, max_gens, stop):
+        while self.best_fitness > target_fitness and not stop.is_set():
+            if max_gens is not None and self.generation >= max_gens:
+                break
+            winner, runner, loser = self._tournament()
+            if loser == winner or loser == runner:
+                out = self._child_buf
+            else:
+                out = self.pop_arr[loser]
+            self.genome.spawn(self.pop_arr[winner], self.pop_arr[runner],
+                              out)
+            if out is self._child_buf:
+                self.pop_arr[loser] = out
+            self.fitness_arr[loser] = self._selection_score_row(self.pop_arr[loser])
+            self._check_best(loser)
+            self.generation += 1
+
+    def _evolve_batched(self, target_fitness, max_gens, stop):
+        """Like ``_evolve_scalar`` but children are buffered and scored
+        in blocks of ``BATCH_SIZE`` with one ``fitfun_batch`` call.
+
+        Tournaments inside a block see the population as it was when the
+        block started; each block commits before the next one begins, so
+        winners are never read before their fitness is known.
+        """
+        child_buf = np.empty((self.BATCH_SIZE, self.genome.n_genes))
+        loser_buf = np.empty(self.BATCH_SIZE, dtype=np.intp)
+        while self.best_fitness > target_fitness and not stop.is_set():
+            k = 0
+            while k < self.BATCH_SIZE:
+                if max_gens is not None and self.generation >= max_gens:
+                    break
+                winner, runner, loser = self._tournament()
+                self.genome.spawn(self.pop_arr[winner],
+                                  self.pop_arr[runner], child_buf[k])
+                loser_buf[k] = loser
+                self.generation += 1
+                k += 1
+            if k == 0:
+                break
+            fits = np.asarray(self.fitfun_batch(child_buf[:k]))
+            for j in range(k):
+                loser = loser_buf[j]
+                self.pop_arr[loser] = child_buf[j]
+                self.fitness_arr[loser] = fits[j]
+            improved = fits < self.best_fitness
+            if improved.any():
+                for j in np.flatnonzero(improved).tolist():
+                    self._check_best(loser_buf[j])
@@ -0,0 +1,64 @@
+"""Genetic-algorithm Sudoku solver.
+
+Blank cells are filled from a permutation of the digits missing from the
+puzzle, so every candidate board has the right digit counts by
+construction and fitness only has to count duplicates within rows,
+columns and boxes.  A fitness of 0 is a solved board.
+"""
+
+import numpy as np
+
+from ga import GA, PermutateGenome
+from sudoku import conflicts
+
+PUZZLE = np.array([
+    5, 3, 0,  0, 7, 0,  0, 0, 0,
+    6, 0, 0,  1, 9, 5,  0, 0, 0,
+    0, 9, 8,  0, 0, 0,  0, 6, 0,
+
+    8, 0, 0,  0, 6, 0,  0, 0, 3,
+    4, 0, 0,  8, 0, 3,  0, 0, 1,
+    7, 0, 0,  0, 2, 0,  0, 0, 6,
+
+    0, 6, 0,  0, 0, 0,  2, 8, 0,
+    0, 0, 0,  4, 1, 9,  0, 0, 5,
+    0, 0, 0,  0, 8, 0,  0, 7, 9,
+], dtype=np.int32)
+
+BLANKS = np.flatnonzero(PUZZLE == 0)
+
+
+def missing_digits():
+    """The digits needed to complete the puzzle, one per blank cell."""
+    counts = np.bincount(PUZZLE, minlength=10)
+    missing = []
+    for digit in range(1, 10):
+        missing.extend([digit] * (9 - counts[digit]))
+    return missing
+
+
+def fill(genes):
+    board = PUZZLE.copy()
+    board[BLANKS] = genes
+    return board
+
+
+def fitness(genome):
+    return conflicts(fill(genome.genes))
+
+
+def show(board):
+    for r in range(9):
+        print(" ".join(str(v) for v in board[9 * r:9 * r + 9]))
+
+
+def main():
+    solver = GA(fitness, PermutateGenome(missing_digits()),
+                pop_size=5000, verbose=True)
+    best, best_fitness = solver.evolve(target_fitness=0)
+    print("best fitness:", best_fitness)
+    show(fill(best.genes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Bitmask (SWAR) Sudoku conflict counting.
+
+Each cell value ``v`` is represented as the bit ``1 << (v - 1)``; a
+row, column or box then collapses to a single 9-bit OR-mask whose
+popcount is its number of distinct digits, so the duplicates in a group
+are ``9 - popcount(mask)``.  All 27 groups are scored with a handful of
+ALU passes — either a numba kernel or vectorized NumPy with a
+512-entry popcount table — instead of building a Python set per group.
+"""
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # numba is optional; the NumPy path is used
+    numba = None
+
+#: cell indices of the 27 groups (9 rows, 9 columns, 9 boxes)
+GROUPS = np.empty((27, 9), dtype=np.int32)
+for _r in range(9):
+    GROUPS[_r] = [9 * _r + c for c in range(9)]
+for _c in range(9):
+    GROUPS[9 + _c] = [9 * r + _c for r in range(9)]
+for _b in range(9):
+    _br, _bc = 3 * (_b // 3), 3 * (_b % 3)
+    GROUPS[18 + _b] = [9 * (_br + r) + _bc + c
+                       for r in range(3) for c in range(3)]
+
+_POPCOUNT9 = np.array([bin(i).count("1") for i in range(1 << 9)],
+                      dtype=np.int32)
+
+if numba is not None:
+    @numba.njit(cache=True)
+    def _conflicts_nb(board, groups):
+        total = 243  # 27 groups x 9 cells, minus one per distinct digit
+        for g in range(groups.shape[0]):
+            mask = 0
+            for j in range(groups.shape[1]):
+                mask |= 1 << (board[groups[g, j]] - 1)
+            while mask:
+                mask &= mask - 1
+                total -= 1
+        return total
+else:
+    _conflicts_nb = None
+
+
+def conflicts(board):
+    """Duplicate digits summed over all rows, columns and boxes of a
+    flat 81-cell board of digits 1..9."""
+    board = np.asarray(board, dtype=np.int32)
+    if _conflicts_nb is not None:
+        return _conflicts_nb(board, GROUPS)
+    masks = np.bitwise_or.reduce(np.left_shift(1, board - 1)[GROUPS],
+                                 axis=1)
+    return int(243 - _POPCOUNT9[masks].sum())